@@ -21,6 +21,16 @@ class Settings(BaseSettings):
     project_board_mapping: dict = mapping.PROJECT_BOARD_CONFIG
     subtask_board_mapping: dict = mapping.SUBTASK_BOARD_CONFIG
 
+    # Adaptive fetch of Monday items, see QueryPlanner
+    monday_page_size: int = 100
+    monday_max_page_size: int = 500
+    monday_max_concurrent_fetches: int = 4
+    monday_max_fetch_retries: int = 3
+
+    # Parquet staging of CSV exports, and sync of changed rows only
+    staging_dir: Path = ROOT_DIR / ".staging"
+    incremental_sync: bool = True
+
     model_config = SettingsConfigDict(
         env_file=str(ROOT_DIR / ".env"),
         env_file_encoding="utf-8"
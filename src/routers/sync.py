@@ -1,12 +1,13 @@
 from pathlib import Path
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 
 from src.config import settings
 from src.dependencies import get_sync_service
 from src.logger import logger
 from src.services.sync import SyncService
-from src.utils import csv
+from src.utils import csv, staging
 
 router = APIRouter()
 
@@ -16,13 +17,29 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 @router.get("/sync-csv")
 def sync_csv(sync_service: SyncService = Depends(get_sync_service)):
     # Load and filter CSV data
-    df_projects, df_subtasks = csv.load_and_filter(str(ROOT_DIR / "sample.csv"))
+    df_projects, df_subtasks, staged_path = csv.load_and_filter(
+        str(ROOT_DIR / "sample.csv")
+    )
     logger.info(f"CSV Projects: {len(df_projects)}, Subtasks: {len(df_subtasks)}")
 
     # Process projects
-    sync_service.sync_projects(df_projects)
+    projects_synced = sync_service.sync_projects(df_projects)
 
     # Process subtasks
-    sync_service.sync_subtasks(df_subtasks)
+    subtasks_synced = sync_service.sync_subtasks(df_subtasks)
+
+    # Next run only processes rows changed after this export, so failed rows
+    # must stay out of the baseline until a run syncs them
+    if not (projects_synced and subtasks_synced):
+        logger.warning("Sync had failures, export not marked as synced.")
+        return JSONResponse(
+            status_code=502,
+            content={
+                "Error": "Sync of CSV to Monday had failures, the export will be sent again on the next run."
+            },
+        )
+
+    if staged_path is not None:
+        staging.mark_synced(staged_path)
 
     return {"Success": "Sync of CSV to Monday complete."}
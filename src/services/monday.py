@@ -1,12 +1,76 @@
+import email.utils
 import json
 import pprint
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 import httpx
-import pandas as pd
 
 import src.utils.monday_values as monday_utils
 from src.config import settings
 from src.logger import logger
+from src.services.query_planner import query_planner
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Single query over the per-query complexity limit, retrying needs a smaller page
+MAX_COMPLEXITY_CODE = "maxComplexityExceeded"
+# Account budget exhausted, retrying needs to wait for the reset
+BUDGET_EXHAUSTED_CODES = ("COMPLEXITY_BUDGET_EXHAUSTED", "ComplexityException")
+# Older API versions only give the reset delay in the message
+RESET_IN_MESSAGE = re.compile(r"reset in (\d+(?:\.\d+)?) seconds", re.IGNORECASE)
+
+
+def _find_error(errors: list[dict], codes: tuple[str, ...]) -> dict | None:
+    """Returns the first error in errors with one of codes, if any."""
+    for error in errors:
+        extensions = error.get("extensions") or {}
+        if extensions.get("code") in codes or error.get("error_code") in codes:
+            return error
+    return None
+
+
+def _retry_in_seconds(error: dict) -> float | None:
+    """Reset delay reported by a Monday.com error, from its extensions or its message."""
+    for details in (error.get("extensions") or {}, error.get("error_data") or {}):
+        if details.get("retry_in_seconds") is not None:
+            return max(float(details["retry_in_seconds"]), 0.0)
+    match = RESET_IN_MESSAGE.search(str(error.get("message", "")))
+    return float(match.group(1)) if match else None
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    """Seconds to wait after a 429 response, None if it does not say.
+
+    Reads retry_in_seconds from the JSON body first, then the Retry-After header,
+    given in seconds or as an HTTP date.
+    """
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if isinstance(body, dict):
+        for error in [body, *(body.get("errors") or [])]:
+            retry_in_seconds = _retry_in_seconds(error)
+            if retry_in_seconds is not None:
+                return retry_in_seconds
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return None
 
 
 class MondayService:
@@ -16,6 +80,8 @@ class MondayService:
         self.headers = {"Authorization": self.api_token}
         # Create client for reusing connections
         self.client = httpx.Client(headers=self.headers)
+        # Shared by all services, the complexity budget belongs to the account
+        self.query_planner = query_planner
 
     def __del__(self):
         self.client.close()
@@ -29,7 +95,7 @@ class MondayService:
         return r.json()
 
     def prepare_mutations(
-        self, csv_df: pd.DataFrame, board_mapping: dict, monday_items: dict
+        self, csv_df: "pd.DataFrame", board_mapping: dict, monday_items: dict
     ) -> tuple:
         """
         Prepare mutations for creating or updating items based on the CSV DataFrame and existing items.
@@ -45,6 +111,8 @@ class MondayService:
             - items_to_update (list): List of items to be updated
         """
 
+        import pandas as pd
+
         items_to_create = []
         items_to_update = []
         key_column_csv = "Key"
@@ -126,10 +194,12 @@ class MondayService:
 
     def fetch_monday_items(
         self, items_keys: list[str], board_id: str, key_column_id: str
-    ) -> dict:
+    ) -> tuple[dict, bool]:
         """Fetch all items from a Board by key_column_id matching any of items_keys.
 
-        Uses pagination to retrieve all items if necessary.
+        Keys are split in chunks fetched concurrently, each chunk using pagination to
+        retrieve all its items. Page sizes and concurrency are chosen by the query
+        planner from the complexity budget reported by Monday.com.
         
         Returns a map of items with the key being the value in the key_column_id.
 
@@ -139,7 +209,8 @@ class MondayService:
             key_column_id (str): ID of the column to match the keys against
 
         Returns:
-            dict: Dictionary mapping item keys to their details. Format:
+            tuple: A tuple containing:
+            - items (dict): Dictionary mapping item keys to their details. Format:
                 {
                     "item_key": {
                         "id": str,
@@ -147,16 +218,51 @@ class MondayService:
                         "column_values": list[dict]
                     },
                 }
+            - complete (bool): False if an error stopped the fetch of some pages
 
         Raises:
             httpx.HTTPError: If there's an error in the HTTP request to Monday.com API"""
 
+        chunk_size = settings.monday_max_page_size
+        keys_chunks = [
+            items_keys[i : i + chunk_size] for i in range(0, len(items_keys), chunk_size)
+        ]
+
+        monday_items_map = {}
+        complete = True
+
+        with ThreadPoolExecutor(
+            max_workers=settings.monday_max_concurrent_fetches
+        ) as executor:
+            for chunk_items_map, chunk_complete in executor.map(
+                lambda keys: self._fetch_items_pages(keys, board_id, key_column_id),
+                keys_chunks,
+            ):
+                monday_items_map.update(chunk_items_map)
+                complete = complete and chunk_complete
+
+        if not monday_items_map:
+            logger.info("No items found.")
+
+        return monday_items_map, complete
+
+    def _fetch_items_pages(
+        self, items_keys: list[str], board_id: str, key_column_id: str
+    ) -> tuple[dict, bool]:
+        """Fetch all pages of items matching items_keys, see fetch_monday_items."""
+
         query = """
-          query ($boardId: ID!, $columnId: String!, $itemsKeys: [String]!, $cursor: String) {
+          query ($boardId: ID!, $columnId: String!, $itemsKeys: [String]!, $limit: Int!, $cursor: String) {
+          complexity {
+            before
+            query
+            after
+            reset_in_x_seconds
+          }
           items_page_by_column_values (
             board_id: $boardId
             columns: [{column_id: $columnId, column_values: $itemsKeys}]
-            limit: 100,
+            limit: $limit,
             cursor: $cursor
           ) {
             cursor
@@ -173,33 +279,55 @@ class MondayService:
         """
 
         monday_items_map = {}
+        complete = True
 
         cursor = None
+        retries = 0
+        page_size_cap = None
 
         while True:
+            page_size = self.query_planner.acquire(page_size_cap)
             variables = {
                 "boardId": board_id,
                 "columnId": key_column_id,
                 "itemsKeys": items_keys,
+                "limit": page_size,
                 "cursor": cursor,
             }
 
             json = {"query": query, "variables": variables}
 
+            data = {}
             try:
                 data = self._call(json=json)
                 if "errors" in data:
+                    if retries < settings.monday_max_fetch_retries:
+                        if _find_error(data["errors"], (MAX_COMPLEXITY_CODE,)):
+                            # Query too complex on its own, retry with a smaller page
+                            retries += 1
+                            page_size_cap = max(page_size // 2, 1)
+                            continue
+
+                        budget_error = _find_error(
+                            data["errors"], BUDGET_EXHAUSTED_CODES
+                        )
+                        if budget_error:
+                            # Budget exhausted, wait for the reset and retry the same page
+                            retries += 1
+                            self.query_planner.pause(_retry_in_seconds(budget_error))
+                            continue
+
                     print(f"GraphQL errors: {data['errors']}")
+                    complete = False
                     break
 
+                retries = 0
+
                 result_data = data.get("data", {}).get(
                     "items_page_by_column_values", {}
                 )
                 items = result_data.get("items", [])
 
-                if not items and cursor is None:
-                    logger.info("No items found.")
-
                 # Process the fetched items and assign the column values to the map
                 for item in items:
                     item_jira_key = next(
@@ -226,21 +354,46 @@ class MondayService:
 
                 logger.info(f"Fetching next page with cursor: {cursor}")
 
-            except httpx.HTTPError as e:
+            except httpx.HTTPStatusError as e:
+                # Rate limited, wait as instructed by Monday.com and retry the same page
+                if (
+                    e.response.status_code == 429
+                    and retries < settings.monday_max_fetch_retries
+                ):
+                    retries += 1
+                    self.query_planner.pause(_retry_after_seconds(e.response))
+                    continue
+
                 logger.error(
                     f"Error fetching items: {e.response.json() if hasattr(e.response, 'json') else str(e)}"
                 )
+                complete = False
                 break
 
-        return monday_items_map
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching items: {str(e)}")
+                complete = False
+                break
+
+            finally:
+                self.query_planner.release(
+                    page_size, (data.get("data") or {}).get("complexity")
+                )
+
+        return monday_items_map, complete
 
     def execute_mutations(
         self, board_id: str, items_to_create: list[dict], items_to_update: list[dict]
-    ):
+    ) -> int:
         """
         Execute create and update mutations for Monday.com items.
+
+        Returns:
+            int: Number of mutations that failed
         """
 
+        failed_mutations = 0
+
         if items_to_create:
             logger.info(f"Creating {len(items_to_create)} items...")
 
@@ -274,12 +427,14 @@ class MondayService:
                         logger.error(
                             f"Error creating item '{item['name']}': {response['errors']}"
                         )
+                        failed_mutations += 1
                     else:
                         logger.info(
                             f"Item '{item['name']}' created with ID: {response['data']['create_item']['id']}"
                         )
                 except httpx.HTTPError as e:
                     logger.error(f"HTTP error creating item '{item['name']}': {str(e)}")
+                    failed_mutations += 1
 
         if items_to_update:
             logger.info(f"Updating {len(items_to_update)} items...")
@@ -313,6 +468,7 @@ class MondayService:
                         logger.error(
                             f"Error updating item ID '{item['item_id']}': {response['errors']}"
                         )
+                        failed_mutations += 1
                     else:
                         logger.info(
                             f"Item ID '{item['item_id']}' updated successfully."
@@ -321,3 +477,6 @@ class MondayService:
                     logger.error(
                         f"HTTP error updating item ID '{item['item_id']}': {str(e)}"
                     )
+                    failed_mutations += 1
+
+        return failed_mutations
@@ -0,0 +1,166 @@
+import threading
+import time
+
+from src.config import settings
+from src.logger import logger
+
+# Wait used when Monday.com rejects a query without saying when the budget resets
+DEFAULT_RETRY_SECONDS = 60.0
+
+
+class QueryPlanner:
+    """Plans Monday.com read queries against the account complexity budget.
+
+    Every response carries a `complexity { before query after reset_in_x_seconds }`
+    block. The planner records it to learn the cost of one item and the budget left,
+    then uses that to:
+        - pick the page size of the next query, largest that leaves room for the
+          other concurrent fetches,
+        - gate how many fetches run at once, by reserving the estimated cost of each
+          query before it is sent,
+        - pause until the budget resets when it cannot cover a useful page, instead
+          of sending small queries that each pay the fixed query cost and fail.
+
+    The budget belongs to the account, so a single instance, `query_planner`, is
+    shared by every MondayService and all the threads fetching for them.
+
+    Args:
+        max_page_size (int): Upper bound of the page size, Monday.com caps it at 500
+        max_concurrent (int): Upper bound of the number of fetches running at once
+        min_page_size (int): Smallest page worth sending, below it the planner waits
+            for the budget reset
+    """
+
+    def __init__(
+        self,
+        max_page_size: int | None = None,
+        max_concurrent: int | None = None,
+        min_page_size: int | None = None,
+    ) -> None:
+        self.max_page_size = max_page_size or settings.monday_max_page_size
+        self.max_concurrent = max_concurrent or settings.monday_max_concurrent_fetches
+        self.min_page_size = min_page_size or max(settings.monday_page_size // 4, 1)
+
+        self._condition = threading.Condition()
+        self._cost_per_item: float | None = None
+        self._budget_left: float = 0
+        self._budget_full: float = 0
+        self._reset_at: float | None = None
+        self._window_s: float = 0
+        self._reserved_items = 0
+        self._in_flight = 0
+
+    def _refresh_budget(self) -> None:
+        """Assumes a full budget once the reset time announced by Monday has passed."""
+        if self._reset_at is not None and time.monotonic() >= self._reset_at:
+            self._budget_left = self._budget_full
+            self._reset_at = None
+
+    def _plan_page_size(self) -> int:
+        if self._cost_per_item is None:
+            return settings.monday_page_size
+
+        # Share what is left of the budget between the fetches allowed to run at once
+        available = self._budget_left - self._reserved_items * self._cost_per_item
+        page_size = int(available / self.max_concurrent / self._cost_per_item)
+        return min(page_size, self.max_page_size)
+
+    def acquire(self, max_page_size: int | None = None) -> int:
+        """Blocks until a query fits in the budget, then reserves it.
+
+        Args:
+            max_page_size (int): Lower cap for this query, e.g. after Monday rejected
+                a larger page as too complex
+
+        Returns:
+            int: Page size to request
+        """
+        with self._condition:
+            while True:
+                self._refresh_budget()
+
+                # Send a single query first to measure the cost of an item
+                if self._cost_per_item is None:
+                    if self._in_flight == 0:
+                        break
+                    self._condition.wait()
+                    continue
+
+                if self._in_flight >= self.max_concurrent:
+                    self._condition.wait()
+                    continue
+
+                if self._plan_page_size() >= self.min_page_size:
+                    break
+
+                if self._in_flight > 0:
+                    # Running fetches will report a fresher budget
+                    self._condition.wait()
+                    continue
+
+                if self._reset_at is None:
+                    # Full budget and still too tight, fall back to a smaller page
+                    break
+
+                wait_seconds = max(self._reset_at - time.monotonic(), 0)
+                logger.info(f"Complexity budget too low, pausing {wait_seconds:.1f}s until reset.")
+                self._condition.wait(timeout=wait_seconds)
+
+            page_size = max(self._plan_page_size(), 1)
+            if max_page_size is not None:
+                page_size = min(page_size, max_page_size)
+            self._reserved_items += page_size
+            self._in_flight += 1
+            return page_size
+
+    def release(self, page_size: int, complexity: dict[str, float] | None = None) -> None:
+        """Frees the reservation of a query and records the complexity it reported.
+
+        Args:
+            page_size (int): Page size returned by acquire for this query
+            complexity (dict): The `complexity` block of the response, if any
+        """
+        with self._condition:
+            self._reserved_items -= page_size
+            self._in_flight -= 1
+
+            if complexity:
+                if complexity.get("query") and page_size:
+                    self._cost_per_item = complexity["query"] / page_size
+                self._budget_full = max(self._budget_full, complexity["before"])
+                self._window_s = max(self._window_s, complexity["reset_in_x_seconds"])
+
+                reset_at = time.monotonic() + complexity["reset_in_x_seconds"]
+                if self._reset_at is None or reset_at > self._reset_at + self._window_s / 2:
+                    # First report of a budget window
+                    self._budget_left = complexity["after"]
+                    self._reset_at = reset_at
+                else:
+                    # Reports of one window can arrive out of order, keep the lowest budget
+                    self._budget_left = min(self._budget_left, complexity["after"])
+                logger.info(
+                    f"Complexity: query {complexity.get('query')}, {complexity['after']} left, reset in {complexity['reset_in_x_seconds']}s."
+                )
+
+            self._condition.notify_all()
+
+    def pause(self, seconds: float | None = None) -> None:
+        """Records that Monday rejected a query for budget reasons and waits it out.
+
+        Args:
+            seconds (float): Wait reported by Monday. If None, waits until the known
+                budget reset, or DEFAULT_RETRY_SECONDS when it is unknown
+        """
+        with self._condition:
+            if seconds is None:
+                if self._reset_at is not None:
+                    seconds = max(self._reset_at - time.monotonic(), 1.0)
+                else:
+                    seconds = DEFAULT_RETRY_SECONDS
+            self._budget_left = 0
+            self._reset_at = time.monotonic() + seconds
+        logger.warning(f"Complexity budget exceeded, pausing {seconds:.1f}s before retrying.")
+        time.sleep(seconds)
+
+
+query_planner = QueryPlanner()
@@ -22,7 +22,7 @@ class SyncService:
     def __init__(self, monday_service: MondayService):
         self.monday_service = monday_service
 
-    def sync_projects(self, df_projects):
+    def sync_projects(self, df_projects) -> bool:
         """Synchronizes project data from a DataFrame to Monday.com projects board.
         
         Handles the creation of new projects and updates to existing ones by comparing
@@ -34,21 +34,21 @@ class SyncService:
                 Can be None or empty, in which case the method returns early.
 
         Returns:
-            None
+            bool: True if every item was fetched and every mutation succeeded
 
         Note:
             Projects are identified by their 'Key' value when matching against
             existing Monday.com items."""
         
         if df_projects is None or df_projects.empty:
-            return
+            return True
 
         logger.info("***Processing Projects***")
         projects_keys = df_projects["Key"].tolist()
         key_column_id = settings.project_board_mapping["Key"]
 
         # Fetch existing projects from Monday
-        existing_projects = self.monday_service.fetch_monday_items(
+        existing_projects, fetch_complete = self.monday_service.fetch_monday_items(
             board_id=settings.projects_board_id,
             items_keys=projects_keys,
             key_column_id=key_column_id,
@@ -56,6 +56,11 @@ class SyncService:
         print("Existing Projects in Monday:")
         pprint.pprint(existing_projects)
 
+        # A partial fetch would make existing projects look new and create duplicates
+        if not fetch_complete:
+            logger.error("Could not fetch all existing projects, skipping mutations.")
+            return False
+
         # Prepare inserts and mutations by comparing CSV with existing items in Monday
         projects_to_create, projects_to_update = self.monday_service.prepare_mutations(
             csv_df=df_projects,
@@ -68,13 +73,13 @@ class SyncService:
         pprint.pprint(projects_to_update)
 
         # Insert and update projects in Monday
-        self.monday_service.execute_mutations(
+        failed_mutations = self.monday_service.execute_mutations(
             settings.projects_board_id, projects_to_create, projects_to_update
         )
         logger.info("***Finished processing projects.***")
-        return
+        return failed_mutations == 0
 
-    def sync_subtasks(self, df_subtasks):
+    def sync_subtasks(self, df_subtasks) -> bool:
         """Synchronizes subtask data from a DataFrame to Monday.com subtasks board.
         
         Handles the creation of new subtasks and updates to existing ones by comparing
@@ -86,7 +91,7 @@ class SyncService:
                 Can be None or empty, in which case the method returns early.
 
         Returns:
-            None
+            bool: True if every item was fetched and every mutation succeeded
 
         Note:
             Subtasks are identified by their 'Key' value when matching against
@@ -94,14 +99,14 @@ class SyncService:
         """
         
         if df_subtasks is None or df_subtasks.empty:
-            return
+            return True
 
         logger.info("***Processing Subtasks***")
         subtasks_keys = df_subtasks["Key"].tolist()
         key_column_id = settings.project_board_mapping["Key"]
 
         # Fetch existing subtasks from Monday
-        existing_subtasks = self.monday_service.fetch_monday_items(
+        existing_subtasks, fetch_complete = self.monday_service.fetch_monday_items(
             board_id=settings.subtasks_board_id,
             items_keys=subtasks_keys,
             key_column_id=key_column_id,
@@ -109,6 +114,11 @@ class SyncService:
         print("Existing subtasks in Monday:")
         pprint.pprint(existing_subtasks)
 
+        # A partial fetch would make existing subtasks look new and create duplicates
+        if not fetch_complete:
+            logger.error("Could not fetch all existing subtasks, skipping mutations.")
+            return False
+
         # Prepare inserts and mutations by comparing CSV with existing items in Monday
         subtasks_to_create, subtasks_to_update = self.monday_service.prepare_mutations(
             csv_df=df_subtasks,
@@ -121,8 +131,8 @@ class SyncService:
         pprint.pprint(subtasks_to_update)
 
         # Insert and update subtasks in Monday
-        self.monday_service.execute_mutations(
+        failed_mutations = self.monday_service.execute_mutations(
             settings.subtasks_board_id, subtasks_to_create, subtasks_to_update
         )
         logger.info("***Finished processing subtasks.***")
-        return
+        return failed_mutations == 0
@@ -1,12 +1,27 @@
-import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from src.config import settings
 from src.logger import logger
+from src.utils import staging
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def load_and_filter(filepath) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Loads the CSV and splits it based on 'Issue Type'."""
+
+def load_and_filter(filepath) -> tuple["pd.DataFrame", "pd.DataFrame", Path | None]:
+    """Loads the CSV and splits it based on 'Issue Type'.
+
+    The export goes through the Parquet staging step, and when incremental sync is
+    enabled only rows changed since the last synced export are returned. The path of
+    the staged export is returned too, to mark it as synced once the sync succeeded.
+    If staging failed, the path is None and every row is returned.
+    """
     try:
-        df = pd.read_csv(filepath, sep=";")
+        df, staged_path = staging.stage_export(filepath)
+        if settings.incremental_sync and staged_path is not None:
+            df = staging.changed_rows(df)
+
         # Ensure 'Issue Type' column exists
         if "Issue Type" not in df.columns:
             raise ValueError("CSV missing 'Issue Type' column.")
@@ -17,8 +32,8 @@ def load_and_filter(filepath) -> tuple[pd.DataFrame, pd.DataFrame]:
         logger.info(
             f"Loaded CSV. Found {len(df_projects)} projects and {len(df_subtasks)} subtasks."
         )
-        return df_projects, df_subtasks
+        return df_projects, df_subtasks, staged_path
 
     except FileNotFoundError:
         logger.error(f"Error: The file '{filepath}' was not found.")
-        return None, None
+        return None, None, None
@@ -1,17 +1,25 @@
-import pandas as pd
+from datetime import datetime
 
 from src.logger import logger
 
 
 def value_to_string(value) -> str:
     """Normalize any value to string format for comparison"""
+    import pandas as pd
+
     return "" if pd.isna(value) or value in (None, "null") else str(value).strip()
 
 
 def normalize_date(date_value) -> str:
     """Normalize Jira date (dd-mm-yyyy HH:MM:SS) to Monday format (yyyy-mm-dd)"""
+    import pandas as pd
+
     try:
-        parsed_date = pd.to_datetime(date_value, dayfirst=True, errors="coerce")
+        if isinstance(date_value, datetime):
+            # Already parsed by the staging step
+            parsed_date = date_value
+        else:
+            parsed_date = pd.to_datetime(date_value, dayfirst=True, errors="coerce")
         if pd.notna(parsed_date):
             return f"{parsed_date.year:04d}-{parsed_date.month:02d}-{parsed_date.day:02d}"
         return ""
@@ -0,0 +1,164 @@
+import contextlib
+import hashlib
+import json
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.config import settings
+from src.logger import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump when the way exports are parsed or typed changes, to invalidate staged files
+STAGING_VERSION = 1
+KEY_COLUMN = "Key"
+
+# Staged exports untouched for this long are removed, a run in progress keeps them fresh
+STAGED_EXPORT_RETENTION_S = 24 * 60 * 60
+
+
+def _date_columns() -> set[str]:
+    """CSV columns mapped to Monday date columns on either board."""
+    mappings = {**settings.project_board_mapping, **settings.subtask_board_mapping}
+    return {csv_col for csv_col, monday_id in mappings.items() if monday_id.startswith("date_")}
+
+
+def _schema_key() -> str:
+    """Identifies the staging rules and sync target, so files built for others are never reused.
+
+    A baseline only holds for the boards and column mappings it was synced with, a
+    change to any of them must send every row again.
+    """
+    rules = json.dumps(
+        {
+            "version": STAGING_VERSION,
+            "projects_board_id": settings.projects_board_id,
+            "subtasks_board_id": settings.subtasks_board_id,
+            "project_board_mapping": settings.project_board_mapping,
+            "subtask_board_mapping": settings.subtask_board_mapping,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(rules.encode()).hexdigest()[:8]
+
+
+def _fingerprint(filepath) -> str:
+    """Content hash of an export, so a re-downloaded identical file reuses its staging."""
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:16]
+
+
+def _baseline_path() -> Path:
+    return Path(settings.staging_dir) / f"baseline-{_schema_key()}.parquet"
+
+
+def _tmp_path(path: Path) -> Path:
+    """Unique sibling of path, written first then renamed so no run reads a partial file."""
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def _prune_staged_exports(staging_dir: Path) -> None:
+    expire_before = time.time() - STAGED_EXPORT_RETENTION_S
+    for old_path in staging_dir.glob("export-*.parquet"):
+        try:
+            if old_path.stat().st_mtime < expire_before:
+                old_path.unlink()
+        except FileNotFoundError:
+            # Pruned by a concurrent run
+            pass
+
+
+def stage_export(filepath) -> tuple["pd.DataFrame", Path | None]:
+    """Returns the export as a typed DataFrame, parsing the CSV only once per file content.
+
+    The first time an export is seen it is parsed as text, its date columns are
+    converted to normalized datetimes, and the result is written to a Parquet file
+    in the staging directory. Later calls for the same content read that file
+    memory-mapped instead of re-parsing the CSV.
+
+    The staged file is only a cache: if it cannot be written, the error is logged and
+    the typed DataFrame is returned without a staged path.
+
+    Returns:
+        tuple: The typed DataFrame and the path of its staged file, to pass to
+            mark_synced, or None if staging failed
+    """
+    import pandas as pd
+
+    staging_dir = Path(settings.staging_dir)
+    staged_path = staging_dir / f"export-{_schema_key()}-{_fingerprint(filepath)}.parquet"
+    if staged_path.exists():
+        logger.info(f"Reading staged export '{staged_path.name}'.")
+        try:
+            # Mark it as in use so it is not pruned during this run
+            staged_path.touch()
+            return pd.read_parquet(staged_path, memory_map=True), staged_path
+        except OSError as e:
+            logger.warning(f"Could not read staged export '{staged_path.name}', parsing CSV: {str(e)}")
+
+    df = pd.read_csv(filepath, sep=";", dtype=str)
+    for col in _date_columns() & set(df.columns):
+        # Jira mixes dd-mm-yyyy and dd-mm-yyyy HH:MM:SS in the same column
+        # Fixed unit so a fresh parse and a staged read compare equal
+        df[col] = pd.to_datetime(df[col], dayfirst=True, format="mixed", errors="coerce").dt.normalize().astype("datetime64[ms]")
+
+    tmp_path = _tmp_path(staged_path)
+    try:
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        _prune_staged_exports(staging_dir)
+        df.to_parquet(tmp_path, index=False)
+        tmp_path.replace(staged_path)
+    except OSError as e:
+        logger.error(f"Could not stage export '{filepath}': {str(e)}")
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        return df, None
+
+    logger.info(f"Staged export '{filepath}' as '{staged_path.name}'.")
+    return df, staged_path
+
+
+def changed_rows(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Returns the rows of df that are new or changed since the last synced export.
+
+    Rows are matched on 'Key'. If no export has been synced yet, every row is returned.
+    """
+    import pandas as pd
+
+    baseline_path = _baseline_path()
+    if not baseline_path.exists():
+        logger.info("No synced export found, all rows will be processed.")
+        return df
+
+    previous = pd.read_parquet(baseline_path, memory_map=True)
+    previous = previous.drop_duplicates(subset=KEY_COLUMN, keep="last").set_index(KEY_COLUMN)
+
+    current = df.set_index(KEY_COLUMN)
+    previous = previous.reindex(index=current.index, columns=current.columns)
+
+    unchanged = (current.eq(previous) | (current.isna() & previous.isna())).all(axis=1)
+    df_changed = df[~unchanged.to_numpy()]
+
+    logger.info(f"Incremental sync: {len(df_changed)} of {len(df)} rows changed since last synced export.")
+    return df_changed
+
+
+def mark_synced(staged_path: Path) -> None:
+    """Records a staged export, as returned by stage_export, as the baseline for the next diff.
+
+    Failures are logged rather than raised: the sync already happened, and a stale
+    baseline only means the next run processes more rows.
+    """
+    baseline_path = _baseline_path()
+    tmp_path = _tmp_path(baseline_path)
+    try:
+        shutil.copyfile(staged_path, tmp_path)
+        tmp_path.replace(baseline_path)
+    except OSError as e:
+        logger.error(f"Could not mark export '{staged_path.name}' as synced: {str(e)}")
+        return
+    logger.info(f"Export '{staged_path.name}' marked as synced.")
@@ -0,0 +1,7 @@
+import os
+
+# Settings are built at import time, provide the required values for tests
+os.environ.setdefault("MONDAY_API_TOKEN", "test-token")
+os.environ.setdefault("MONDAY_API_ENDPOINT", "https://api.monday.test/v2")
+os.environ.setdefault("PROJECTS_BOARD_ID", "1")
+os.environ.setdefault("SUBTASKS_BOARD_ID", "2")
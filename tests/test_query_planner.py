@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from src.services import query_planner as query_planner_module
+from src.services.monday import MondayService, _retry_after_seconds
+from src.services.query_planner import DEFAULT_RETRY_SECONDS, QueryPlanner
+
+KEY_COLUMN_ID = "text_key"
+
+
+class FakeMonday:
+    """Monday.com items_page_by_column_values endpoint with a complexity budget.
+
+    Each query costs cost_per_item for every item of its limit. The budget refills
+    every reset_seconds, and queries it cannot cover are rejected like Monday does.
+
+    With overlap, the requests following the first one are held until that many of
+    them are in flight at once, so a planner that never runs fetches concurrently
+    breaks the barrier instead of passing by chance.
+    """
+
+    def __init__(
+        self,
+        budget,
+        reset_seconds=0.2,
+        cost_per_item=10,
+        max_query_complexity=None,
+        overlap=None,
+        exhausted=False,
+        budget_error_code="COMPLEXITY_BUDGET_EXHAUSTED",
+    ):
+        self.budget = budget
+        self.budget_left = 0 if exhausted else budget
+        self.reset_seconds = reset_seconds
+        self.reset_at = time.monotonic() + reset_seconds
+        self.cost_per_item = cost_per_item
+        self.max_query_complexity = max_query_complexity
+        self.budget_error_code = budget_error_code
+        self.barrier = threading.Barrier(overlap, timeout=5) if overlap else None
+
+        self.requests = 0
+        self.limits = []
+        self.rejected = 0
+        self.windows = 1
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+
+        with self._lock:
+            self.requests += 1
+            held = self.barrier is not None and 1 < self.requests <= 1 + self.barrier.parties
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        if held:
+            self.barrier.wait()
+
+        with self._lock:
+            response = self._respond(variables)
+            self.in_flight -= 1
+        return response
+
+    def _respond(self, variables):
+        limit = variables["limit"]
+        cost = limit * self.cost_per_item
+
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.budget_left = self.budget
+            self.reset_at = now + self.reset_seconds
+            self.windows += 1
+        reset_in = max(self.reset_at - now, 0)
+
+        if self.max_query_complexity is not None and cost > self.max_query_complexity:
+            return self._error("maxComplexityExceeded", "Query has complexity above the max")
+        if cost > self.budget_left:
+            if self.budget_error_code == "ComplexityException":
+                # Older API versions only give the reset delay in the message
+                return self._error("ComplexityException", f"Complexity budget exhausted, reset in {reset_in:.3f} seconds")
+            return self._error(self.budget_error_code, "Complexity budget exhausted", retry_in_seconds=reset_in)
+
+        before = self.budget_left
+        self.budget_left -= cost
+        self.limits.append(limit)
+        return self._page(variables, before, cost, reset_in)
+
+    def _error(self, code, message, **extensions):
+        self.rejected += 1
+        return httpx.Response(200, json={"errors": [{"message": message, "extensions": {"code": code, **extensions}}]})
+
+    def _page(self, variables, before, cost, reset_in):
+        start = int(variables["cursor"] or 0)
+        end = start + variables["limit"]
+        keys = variables["itemsKeys"]
+        items = [{"id": key, "name": key, "column_values": [{"id": KEY_COLUMN_ID, "text": key}]} for key in keys[start:end]]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "complexity": {"before": before, "query": cost, "after": before - cost, "reset_in_x_seconds": reset_in},
+                    "items_page_by_column_values": {"cursor": str(end) if end < len(keys) else None, "items": items},
+                }
+            },
+        )
+
+
+def fetch(fake, keys_count):
+    monday_service = MondayService()
+    monday_service.client = httpx.Client(transport=httpx.MockTransport(fake.handler))
+    # Fresh budget knowledge for each test instead of the shared planner
+    monday_service.query_planner = QueryPlanner()
+    keys = [f"KEY-{i}" for i in range(keys_count)]
+    items, complete = monday_service.fetch_monday_items(keys, "1", KEY_COLUMN_ID)
+    return keys, items, complete
+
+
+def test_monday_services_share_planner():
+    assert MondayService().query_planner is MondayService().query_planner
+
+
+def test_page_size_grows_with_budget():
+    fake = FakeMonday(budget=10_000_000, overlap=2)
+
+    keys, items, complete = fetch(fake, 3000)
+
+    assert complete
+    assert sorted(items) == sorted(keys)
+    assert fake.limits[0] == 100
+    assert max(fake.limits) == 500
+    assert 2 <= fake.max_in_flight <= 4
+    assert fake.rejected == 0
+
+
+def test_page_size_shrinks_and_pauses_until_reset():
+    fake = FakeMonday(budget=20_000, reset_seconds=0.2)
+
+    keys, items, complete = fetch(fake, 3000)
+
+    assert complete
+    assert sorted(items) == sorted(keys)
+    # 30k of cost needs a second 20k budget window, reached without any rejection
+    assert fake.windows >= 2
+    assert fake.rejected == 0
+    assert min(fake.limits) >= 25
+
+
+@pytest.mark.parametrize("budget_error_code", ["COMPLEXITY_BUDGET_EXHAUSTED", "ComplexityException"])
+def test_budget_error_pauses_until_reset(budget_error_code):
+    fake = FakeMonday(budget=10_000_000, reset_seconds=0.1, exhausted=True, budget_error_code=budget_error_code)
+
+    keys, items, complete = fetch(fake, 100)
+
+    assert complete
+    assert sorted(items) == sorted(keys)
+    assert fake.rejected == 1
+    # Waiting, not shrinking, is the answer to an exhausted budget
+    assert fake.limits == [100]
+
+
+def test_query_too_complex_retries_with_smaller_page():
+    fake = FakeMonday(budget=10_000_000, max_query_complexity=300)
+
+    keys, items, complete = fetch(fake, 100)
+
+    assert complete
+    assert sorted(items) == sorted(keys)
+    assert fake.rejected == 2
+    assert set(fake.limits) == {25}
+
+
+def test_query_always_too_complex_gives_up():
+    fake = FakeMonday(budget=10_000_000, max_query_complexity=0)
+
+    _, items, complete = fetch(fake, 100)
+
+    assert not complete
+    assert items == {}
+    assert fake.rejected == 4
+
+
+def test_pause_without_delay_waits_for_known_reset(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(query_planner_module.time, "sleep", sleeps.append)
+
+    QueryPlanner().pause()
+
+    planner = QueryPlanner()
+    page_size = planner.acquire()
+    planner.release(page_size, {"before": 1000, "query": 100, "after": 900, "reset_in_x_seconds": 30})
+    planner.pause()
+
+    assert sleeps[0] == DEFAULT_RETRY_SECONDS
+    assert sleeps[1] == pytest.approx(30, abs=1)
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        (httpx.Response(429, json={"errors": [{"message": "Rate limit", "extensions": {"retry_in_seconds": 7}}]}), 7),
+        (httpx.Response(429, json={"error_code": "RATE_LIMIT", "error_data": {"retry_in_seconds": 9}}), 9),
+        (httpx.Response(429, json={"errors": [{"message": "Rate limit"}]}, headers={"Retry-After": "12"}), 12),
+        (httpx.Response(429, headers={"Retry-After": "not a date"}), None),
+        (httpx.Response(429), None),
+    ],
+)
+def test_retry_after_seconds(response, expected):
+    assert _retry_after_seconds(response) == expected
+
+
+def test_retry_after_seconds_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    headers = {"Retry-After": format_datetime(retry_at, usegmt=True)}
+
+    assert _retry_after_seconds(httpx.Response(429, headers=headers)) == pytest.approx(30, abs=2)
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from src.config import ROOT_DIR, settings
+from src.utils import staging
+
+SAMPLE_CSV = ROOT_DIR / "sample.csv"
+
+
+@pytest.fixture(autouse=True)
+def staging_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", tmp_path / "staging")
+    return settings.staging_dir
+
+
+@pytest.fixture
+def export_csv(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(SAMPLE_CSV.read_text())
+    return path
+
+
+def test_stage_export_types_dates_and_reuses_staged_file(export_csv, monkeypatch):
+    df, staged_path = staging.stage_export(export_csv)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["Begin Date"])
+    assert df.loc[df["Key"] == "ACCXAAS-8772", "Begin Date"].iloc[0] == pd.Timestamp("2026-08-30")
+
+    # Breaking the CSV parser proves the second call reads the staged file
+    monkeypatch.setattr(pd, "read_csv", None)
+    df_again, staged_path_again = staging.stage_export(export_csv)
+    assert staged_path_again == staged_path
+    pd.testing.assert_frame_equal(df_again, df)
+
+
+def test_changed_rows_only_after_mark_synced(export_csv):
+    df, staged_path = staging.stage_export(export_csv)
+    assert len(staging.changed_rows(df)) == len(df)
+
+    # A failed sync does not mark the export, every row is processed again
+    assert len(staging.changed_rows(df)) == len(df)
+
+    staging.mark_synced(staged_path)
+    assert staging.changed_rows(df).empty
+
+    export_csv.write_text(export_csv.read_text().replace("CACHE HTTP;", "CACHE HTTPS;"))
+    df_edited, _ = staging.stage_export(export_csv)
+    assert staging.changed_rows(df_edited)["Summary"].tolist() == ["CACHE HTTPS"]
+
+
+def test_date_mapping_change_invalidates_staged_files(export_csv, monkeypatch):
+    df, staged_path = staging.stage_export(export_csv)
+    staging.mark_synced(staged_path)
+
+    mapping = {**settings.project_board_mapping, "Begin Date": "text_begin_date"}
+    monkeypatch.setattr(settings, "project_board_mapping", mapping)
+    monkeypatch.setattr(settings, "subtask_board_mapping", mapping)
+
+    df_remapped, remapped_path = staging.stage_export(export_csv)
+    assert remapped_path != staged_path
+    assert not pd.api.types.is_datetime64_any_dtype(df_remapped["Begin Date"])
+    assert len(staging.changed_rows(df_remapped)) == len(df_remapped)
+
+
+def test_board_change_invalidates_baseline(export_csv, monkeypatch):
+    df, staged_path = staging.stage_export(export_csv)
+    staging.mark_synced(staged_path)
+    assert staging.changed_rows(df).empty
+
+    monkeypatch.setattr(settings, "projects_board_id", settings.projects_board_id + 100)
+
+    df_new_board, _ = staging.stage_export(export_csv)
+    assert len(staging.changed_rows(df_new_board)) == len(df_new_board)
+
+
+def test_stage_export_write_failure_returns_typed_frame(export_csv, monkeypatch, tmp_path):
+    # A file where the staging directory should be makes every write fail
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    monkeypatch.setattr(settings, "staging_dir", blocker / "staging")
+
+    df, staged_path = staging.stage_export(export_csv)
+
+    assert staged_path is None
+    assert pd.api.types.is_datetime64_any_dtype(df["Begin Date"])
+
+
+def test_mark_synced_missing_staged_file_does_not_raise(export_csv):
+    _, staged_path = staging.stage_export(export_csv)
+    staged_path.unlink()
+
+    staging.mark_synced(staged_path)
+
+    assert not list(settings.staging_dir.glob("baseline-*"))
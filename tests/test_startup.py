@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.config import ROOT_DIR
+
+# Cold import of the app, without pandas, measured at ~0.5s
+IMPORT_TIME_BUDGET_S = 1.5
+
+STARTUP_SCRIPT = """
+import json, sys, time
+
+start = time.perf_counter()
+import src.main
+import_time = time.perf_counter() - start
+
+from fastapi.testclient import TestClient
+
+response = TestClient(src.main.app).get("/")
+
+print(json.dumps({
+    "import_time": import_time,
+    "status_code": response.status_code,
+    "pandas_loaded": "pandas" in sys.modules,
+}))
+"""
+
+
+def run_startup() -> dict:
+    """Imports the app and calls the health route in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        cwd=ROOT_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_health_route_does_not_load_pandas():
+    startup = run_startup()
+
+    assert startup["status_code"] == 200
+    assert not startup["pandas_loaded"]
+
+
+def test_import_time_within_budget():
+    startup = run_startup()
+
+    assert startup["import_time"] < IMPORT_TIME_BUDGET_S
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.dependencies import get_sync_service
+from src.main import app
+
+
+class StubSyncService:
+    def __init__(self, projects_synced, subtasks_synced):
+        self.projects_synced = projects_synced
+        self.subtasks_synced = subtasks_synced
+
+    def sync_projects(self, df_projects):
+        return self.projects_synced
+
+    def sync_subtasks(self, df_subtasks):
+        return self.subtasks_synced
+
+
+@pytest.fixture
+def staging_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "staging_dir", tmp_path / "staging")
+    return settings.staging_dir
+
+
+def sync_csv(sync_service):
+    app.dependency_overrides[get_sync_service] = lambda: sync_service
+    try:
+        return TestClient(app).get("/sync-csv")
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_sync_csv_marks_export_synced(staging_dir):
+    response = sync_csv(StubSyncService(True, True))
+
+    assert response.status_code == 200
+    assert "Success" in response.json()
+    assert list(staging_dir.glob("baseline-*.parquet"))
+
+
+@pytest.mark.parametrize("projects_synced, subtasks_synced", [(False, True), (True, False)])
+def test_sync_csv_failure_reports_error_and_keeps_baseline(staging_dir, projects_synced, subtasks_synced):
+    response = sync_csv(StubSyncService(projects_synced, subtasks_synced))
+
+    assert response.status_code == 502
+    assert "Error" in response.json()
+    assert not list(staging_dir.glob("baseline-*.parquet"))